@@ -3,6 +3,37 @@ import json
 from datetime import datetime
 import subprocess
 import os
+import time
+import urllib.request
+
+# The long-running status API owns the synthetic prober, this function only reads it
+STATUS_API_URL = os.environ.get('STATUS_API_URL', 'https://status.prash.shop')
+
+# Figures are cached per warm function instance so most renders skip the
+# round trip; failures are cached too so an outage doesn't stall every render
+UPTIME_CACHE_SECONDS = 60
+uptime_cache = {"expires": 0, "figures": {"response_time": "n/a", "uptime": "n/a"}}
+
+def get_uptime_figures():
+    now = time.time()
+    if now < uptime_cache["expires"]:
+        return uptime_cache["figures"]
+
+    figures = {"response_time": "n/a", "uptime": "n/a"}
+    try:
+        with urllib.request.urlopen(f"{STATUS_API_URL}/api/uptime", timeout=2) as response:
+            targets = json.loads(response.read()).get("targets", {})
+        probe = targets.get("https://prash.shop/")
+        if probe and probe["p50_ms"] is not None:
+            figures["response_time"] = f"p50 {probe['p50_ms']:.0f}ms / p99 {probe['p99_ms']:.0f}ms"
+        if probe:
+            figures["uptime"] = f"{probe['uptime_percent']}%"
+    except Exception:
+        pass
+
+    uptime_cache["figures"] = figures
+    uptime_cache["expires"] = now + UPTIME_CACHE_SECONDS
+    return figures
 
 class handler(BaseHTTPRequestHandler):
     def do_GET(self):
@@ -43,8 +74,8 @@ body {{ font-family: 'Segoe UI', sans-serif; background: linear-gradient(135deg,
 <div class="status-card">
 <div class="card-header"><div class="card-icon">💚</div><div>Health Status</div></div>
 <div class="metric"><span>Overall:</span><span class="status-healthy">Healthy</span></div>
-<div class="metric"><span>Response:</span><span>&lt; 50ms</span></div>
-<div class="metric"><span>Uptime:</span><span>99.9%</span></div>
+<div class="metric"><span>Response:</span><span>{metrics["response_time"]}</span></div>
+<div class="metric"><span>Uptime:</span><span>{metrics["uptime"]}</span></div>
 </div>
 <div class="status-card">
 <div class="card-header"><div class="card-icon">☁️</div><div>Free Hosting</div></div>
@@ -63,5 +94,6 @@ body {{ font-family: 'Segoe UI', sans-serif; background: linear-gradient(135deg,
         return {
             "status": "healthy",
             "timestamp": datetime.utcnow().isoformat(),
-            "platform": "vercel_functions"
+            "platform": "vercel_functions",
+            **get_uptime_figures()
         }
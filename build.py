@@ -0,0 +1,321 @@
+"""Build optimized static assets for the portfolio pages.
+
+    python build.py [--src .] [--out <src>/dist]
+
+For every page this minifies the HTML and its inline CSS/JS, inlines local
+stylesheets and makes the web font import non-blocking, turns local <img>
+tags into <picture> elements with responsive AVIF/WebP variants, gives every
+image a content-hashed name for immutable caching and writes precompressed
+.gz siblings next to the text files for nginx's gzip_static. A before/after
+page weight report is printed at the end.
+
+Pillow is declared in pyproject.toml and installed in the Docker build; for
+ad-hoc runs without it images are only fingerprinted.
+"""
+import argparse
+import gzip
+import hashlib
+import io
+import os
+import re
+import shutil
+import sys
+
+try:
+    from PIL import Image, features
+except ImportError:
+    Image = None
+
+PAGES = ["index.html", "resume.html"]
+DEFAULT_OUT = "dist"
+
+# Widths used when the markup doesn't tell us how large an image is shown
+DEFAULT_WIDTHS = (480, 960, 1440)
+WEBP_QUALITY = 80
+AVIF_QUALITY = 60
+COMPRESSIBLE = (".html", ".css", ".js", ".svg", ".json")
+MIN_COMPRESS_BYTES = 512
+
+STRING_OR_COMMENT = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')|/\*.*?\*/', re.S)
+STRING = re.compile(r'("(?:\\.|[^"\\])*"|\'(?:\\.|[^\'\\])*\')')
+RAW_BLOCK = re.compile(r'(<(script|style|pre|textarea)\b[^>]*>)(.*?)(</\2\s*>)', re.S | re.I)
+IMG_TAG = re.compile(r'<img\b([^>]*)>', re.I)
+STYLESHEET_LINK = re.compile(r'<link\b([^>]*)>', re.I)
+ATTRIBUTE = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+FONT_IMPORT = re.compile(r'@import\s+url\(\s*[\'"]?(https?://[^\'")]+)[\'"]?\s*\)\s*;?')
+
+
+def fingerprint(name, data):
+    """nsb.png -> nsb.3f2a9c01de.png, so the name changes whenever the bytes do"""
+    stem, ext = os.path.splitext(name)
+    return f"{stem}.{hashlib.sha256(data).hexdigest()[:10]}{ext}"
+
+
+def minify_css(css):
+    css = STRING_OR_COMMENT.sub(lambda m: m.group(1) or "", css)
+    parts = STRING.split(css)
+    for i in range(0, len(parts), 2):
+        text = re.sub(r"\s+", " ", parts[i])
+        text = re.sub(r"\s*([{};,>])\s*", r"\1", text)
+        text = re.sub(r":\s+", ":", text)
+        parts[i] = text.replace(";}", "}")
+    return "".join(parts).strip()
+
+
+def minify_js(js):
+    """Conservative: drop indentation, blank lines and whole-line comments.
+
+    Newlines are kept so automatic semicolon insertion still works. Scripts
+    with template literals are left alone since a line inside one may be
+    part of a string.
+    """
+    if "`" in js:
+        return js
+    lines = (line.strip() for line in js.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+
+def minify_html(html):
+    """Collapse whitespace and drop comments outside script/style/pre blocks"""
+    blocks = []
+
+    def stash(match):
+        open_tag, tag, body, close_tag = match.groups()
+        tag = tag.lower()
+        if tag == "style":
+            body = minify_css(body)
+        elif tag == "script" and "src=" not in open_tag.lower():
+            body = minify_js(body)
+        blocks.append(open_tag + body + close_tag)
+        return f"\x00{len(blocks) - 1}\x00"
+
+    html = RAW_BLOCK.sub(stash, html)
+    html = re.sub(r"<!--(?!\[if).*?-->", "", html, flags=re.S)
+    html = re.sub(r"\s+", " ", html)
+    html = re.sub(r"\x00(\d+)\x00", lambda m: blocks[int(m.group(1))], html)
+    return html.strip() + "\n"
+
+
+def parse_attributes(text):
+    attributes = {}
+    for match in ATTRIBUTE.finditer(text):
+        name, double, single, bare = match.groups()
+        value = double if double is not None else single if single is not None else bare
+        attributes[name.lower()] = value
+    return attributes
+
+
+def render_attributes(attributes):
+    return "".join(f' {name}' if value is None else f' {name}="{value}"' for name, value in attributes.items())
+
+
+def is_local(src):
+    return bool(src) and not re.match(r"^([a-z]+:|//|/_)", src, re.I)
+
+
+class AssetBuilder:
+    """Builds the pages from `src_dir` into `out_dir` and tracks page weight"""
+
+    def __init__(self, src_dir, out_dir):
+        # The output directory is wiped before every build, so it must never
+        # be the source tree or one of its parents
+        src, out = os.path.realpath(src_dir), os.path.realpath(out_dir)
+        if os.path.commonpath([src, out]) == out:
+            raise ValueError(f"Output directory {out_dir} would overwrite the sources in {src_dir}")
+        self.src_dir = src_dir
+        self.out_dir = out_dir
+        self.outputs = {}
+        self.report = []
+        self.avif = Image is not None and features.check("avif")
+        if Image is None:
+            print("warning: Pillow not installed, skipping responsive image variants", file=sys.stderr)
+        elif not self.avif:
+            print("warning: Pillow built without AVIF support, emitting WebP only", file=sys.stderr)
+
+    def write(self, name, data):
+        with open(os.path.join(self.out_dir, name), "wb") as f:
+            f.write(data)
+
+    def emit(self, name, data):
+        """Write an asset under its fingerprinted name, once per content"""
+        if (name, data) not in self.outputs:
+            hashed = fingerprint(name, data)
+            self.write(hashed, data)
+            self.outputs[(name, data)] = hashed
+        return self.outputs[(name, data)]
+
+    # -- images -------------------------------------------------------------
+
+    def encode(self, image, fmt):
+        buffer = io.BytesIO()
+        if fmt == "avif":
+            image.save(buffer, "AVIF", quality=AVIF_QUALITY)
+        else:
+            image.save(buffer, "WEBP", quality=WEBP_QUALITY, method=6)
+        return buffer.getvalue()
+
+    def build_image(self, tag_attributes, page_stats):
+        """Return the markup replacing one <img>, recording bytes before/after"""
+        src = tag_attributes.get("src")
+        path = os.path.join(self.src_dir, src.lstrip("/"))
+        with open(path, "rb") as f:
+            original = f.read()
+        page_stats["before"] += len(original)
+
+        attributes = dict(tag_attributes)
+        attributes["src"] = self.emit(os.path.basename(src), original)
+        attributes.setdefault("loading", "lazy")
+        attributes.setdefault("decoding", "async")
+
+        if Image is None:
+            page_stats["after"] += len(original)
+            return f"<img{render_attributes(attributes)}>"
+
+        with Image.open(path) as image:
+            image.load()
+            natural_width, natural_height = image.size
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+            # A fixed CSS height tells us the display width, so we can size
+            # 1x/2x variants for it and reserve the layout box up front
+            height = re.search(r"(?:^|;)\s*height:\s*(\d+)px", attributes.get("style") or "")
+            if height:
+                display_height = int(height.group(1))
+                display_width = round(display_height * natural_width / natural_height)
+                widths = sorted({min(w, natural_width) for w in (display_width, 2 * display_width)})
+                sizes = f"{display_width}px"
+                attributes.setdefault("width", str(display_width))
+                attributes.setdefault("height", str(display_height))
+            else:
+                widths = sorted({min(w, natural_width) for w in DEFAULT_WIDTHS})
+                sizes = "100vw"
+
+            stem = os.path.splitext(os.path.basename(src))[0]
+            sources = []
+            smallest_first = None
+            for fmt in (["avif"] if self.avif else []) + ["webp"]:
+                candidates = []
+                for width in widths:
+                    variant = image if width == natural_width else image.resize(
+                        (width, round(natural_height * width / natural_width)), Image.LANCZOS)
+                    data = self.encode(variant, fmt)
+                    candidates.append(f"{self.emit(f'{stem}-{width}w.{fmt}', data)} {width}w")
+                    if width == widths[0] and (smallest_first is None or len(data) < smallest_first):
+                        smallest_first = len(data)
+                sources.append(f'<source type="image/{fmt}" srcset="{", ".join(candidates)}" sizes="{sizes}">')
+
+        page_stats["after"] += smallest_first
+        return f"<picture>{''.join(sources)}<img{render_attributes(attributes)}></picture>"
+
+    # -- pages --------------------------------------------------------------
+
+    def inline_stylesheets(self, html):
+        """Inline local stylesheets and load remote font CSS without blocking"""
+        def inline(match):
+            attributes = parse_attributes(match.group(1))
+            href = attributes.get("href")
+            if (attributes.get("rel") or "").lower() != "stylesheet" or not is_local(href):
+                return match.group(0)
+            with open(os.path.join(self.src_dir, href.lstrip("/")), encoding="utf-8") as f:
+                return f"<style>{f.read()}</style>"
+
+        html = STYLESHEET_LINK.sub(inline, html)
+
+        imports = []
+
+        def hoist(match):
+            imports.append(match.group(1))
+            return ""
+
+        html = re.sub(r"<style\b[^>]*>.*?</style>",
+                      lambda m: FONT_IMPORT.sub(hoist, m.group(0)), html, flags=re.S | re.I)
+        if imports:
+            links = ['<link rel="preconnect" href="https://fonts.gstatic.com" crossorigin>']
+            for url in dict.fromkeys(imports):
+                links.append(f'<link rel="stylesheet" href="{url}" media="print" onload="this.media=\'all\'">'
+                             f'<noscript><link rel="stylesheet" href="{url}"></noscript>')
+            html = re.sub(r"<style\b", lambda m: "".join(links) + m.group(0), html, count=1, flags=re.I)
+        return html
+
+    def build_page(self, page):
+        with open(os.path.join(self.src_dir, page), encoding="utf-8") as f:
+            source = f.read()
+        stats = {"page": page, "html_before": len(source.encode()), "before": 0, "after": 0}
+
+        html = self.inline_stylesheets(source)
+
+        def replace_image(match):
+            attributes = parse_attributes(match.group(1))
+            src = attributes.get("src")
+            if not is_local(src) or not os.path.exists(os.path.join(self.src_dir, src.lstrip("/"))):
+                return match.group(0)
+            return self.build_image(attributes, stats)
+
+        html = IMG_TAG.sub(replace_image, html)
+        data = minify_html(html).encode()
+        self.write(page, data)
+
+        stats["html_after"] = len(data)
+        stats["html_transfer"] = len(self.compress(data)) if len(data) >= MIN_COMPRESS_BYTES else len(data)
+        stats["before"] += stats["html_before"]
+        stats["after"] += stats["html_transfer"]
+        self.report.append(stats)
+
+    @staticmethod
+    def compress(data):
+        return gzip.compress(data, compresslevel=9, mtime=0)
+
+    def precompress(self):
+        for name in sorted(os.listdir(self.out_dir)):
+            if not name.endswith(COMPRESSIBLE):
+                continue
+            with open(os.path.join(self.out_dir, name), "rb") as f:
+                data = f.read()
+            if len(data) < MIN_COMPRESS_BYTES:
+                continue
+            compressed = self.compress(data)
+            if len(compressed) < len(data):
+                self.write(name + ".gz", compressed)
+
+    def build(self, pages=PAGES):
+        if os.path.isdir(self.out_dir):
+            shutil.rmtree(self.out_dir)
+        os.makedirs(self.out_dir)
+        for page in pages:
+            self.build_page(page)
+        self.precompress()
+        return self.report
+
+
+def format_kb(size):
+    return f"{size / 1024:.1f} KB"
+
+
+def print_report(report):
+    print(f"{'page':<14}{'html':>24}{'page weight':>28}")
+    for stats in report:
+        html = f"{format_kb(stats['html_before'])} -> {format_kb(stats['html_transfer'])}"
+        weight = f"{format_kb(stats['before'])} -> {format_kb(stats['after'])}"
+        saved = 100 * (1 - stats["after"] / stats["before"])
+        print(f"{stats['page']:<14}{html:>24}{weight:>28}  (-{saved:.0f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build optimized static assets for the portfolio")
+    parser.add_argument("--src", default=os.path.dirname(os.path.abspath(__file__)))
+    parser.add_argument("--out", help=f"output directory, wiped before every build (default: <src>/{DEFAULT_OUT})")
+    args = parser.parse_args()
+    # Default next to the sources, never into whatever directory we run from
+    if args.out is None:
+        args.out = os.path.join(args.src, DEFAULT_OUT)
+
+    try:
+        builder = AssetBuilder(args.src, args.out)
+    except ValueError as e:
+        parser.error(str(e))
+    print_report(builder.build())
+
+
+if __name__ == "__main__":
+    main()
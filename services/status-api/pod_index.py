@@ -0,0 +1,365 @@
+"""In-memory pod index backing the dashboard and the /api/pods and /api/namespaces endpoints.
+
+The index is fed from periodic `kubectl get pods -o json` listings and keeps
+secondary indexes by phase and label so drill-down queries never have to
+touch the cluster.
+"""
+import base64
+import re
+import threading
+import time
+from bisect import bisect_left, bisect_right
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+# Past this many pending changes a posting is re-sorted instead of patched
+REBUILD_THRESHOLD = 64
+
+# Most keys one query walks before returning a partial page with a cursor,
+# which keeps sparse intersections (e.g. two large disjoint labels) well
+# under a millisecond instead of scanning the whole posting
+MAX_SCAN_KEYS = 1024
+
+LABEL_KEY = re.compile(r"^([A-Za-z0-9][-A-Za-z0-9_.]*/)?[A-Za-z0-9]([-A-Za-z0-9_.]*[A-Za-z0-9])?$")
+LABEL_VALUE = re.compile(r"^([A-Za-z0-9]([-A-Za-z0-9_.]*[A-Za-z0-9])?)?$")
+
+
+def pod_key(namespace, name):
+    # Keys sort by namespace first, so one namespace is a contiguous range
+    return f"{namespace}/{name}"
+
+
+def encode_cursor(key):
+    return base64.urlsafe_b64encode(key.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor):
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return base64.urlsafe_b64decode(padded.encode()).decode()
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+def parse_pod(item):
+    """Flatten a pod object from the Kubernetes API into the record we serve"""
+    metadata = item.get("metadata", {})
+    spec = item.get("spec", {})
+    status = item.get("status", {})
+    container_statuses = status.get("containerStatuses") or []
+
+    return {
+        "name": metadata.get("name", ""),
+        "namespace": metadata.get("namespace", "default"),
+        "phase": status.get("phase", "Unknown"),
+        "node": spec.get("nodeName"),
+        "labels": dict(metadata.get("labels") or {}),
+        "ready": f"{sum(1 for c in container_statuses if c.get('ready'))}/{len(container_statuses)}",
+        "restarts": sum(c.get("restartCount", 0) for c in container_statuses),
+        "created": metadata.get("creationTimestamp"),
+        "resource_version": metadata.get("resourceVersion"),
+    }
+
+
+def parse_label_selector(selectors):
+    """Turn ["app=portfolio", "tier=web"] into [("app", "portfolio"), ...]
+
+    Only equality terms (`=` or `==`) are supported; `!=`, `in (...)`,
+    `notin` and existence selectors raise ValueError.
+    """
+    parsed = []
+    for selector in selectors:
+        for term in selector.split(","):
+            term = term.strip()
+            if not term:
+                continue
+            key, sep, value = term.partition("=")
+            if value.startswith("="):
+                value = value[1:]
+            key, value = key.strip(), value.strip()
+            if not sep or not LABEL_KEY.match(key) or not LABEL_VALUE.match(value):
+                raise ValueError(f"Unsupported label selector: {term} (only key=value is supported)")
+            parsed.append((key, value))
+    return parsed
+
+
+class _Postings:
+    """Pod keys sharing one indexed value, as a set and in sorted order"""
+
+    __slots__ = ("keys", "order", "pending")
+
+    def __init__(self):
+        self.keys = set()
+        self.order = []
+        self.pending = set()
+
+    def add(self, key):
+        self.keys.add(key)
+        self.pending.add(key)
+
+    def discard(self, key):
+        self.keys.discard(key)
+        self.pending.add(key)
+
+    def flush(self):
+        """Bring the sorted order in line with the key set"""
+        if len(self.pending) > REBUILD_THRESHOLD:
+            self.order = sorted(self.keys)
+        else:
+            for key in self.pending:
+                i = bisect_left(self.order, key)
+                present = i < len(self.order) and self.order[i] == key
+                if key in self.keys and not present:
+                    self.order.insert(i, key)
+                elif key not in self.keys and present:
+                    del self.order[i]
+        self.pending.clear()
+
+
+class PodIndex:
+    """Pods keyed by namespace/name with phase and label indexes.
+
+    Updates are incremental: `sync()` diffs each full listing against the
+    current contents by resourceVersion, so only pods that changed since the
+    previous listing touch the indexes.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._pods = {}
+        self._all = _Postings()
+        self._by_phase = {}
+        self._by_label = {}
+        self._namespace_phases = {}
+        self._node_pods = {}
+        self._dirty = set()
+        self.last_sync = None
+        self.generation = 0
+
+    def __len__(self):
+        return len(self._pods)
+
+    # -- mutation -----------------------------------------------------------
+
+    def _postings_for(self, pod):
+        postings = [self._all, self._by_phase.setdefault(pod["phase"], _Postings())]
+        for label in pod["labels"].items():
+            postings.append(self._by_label.setdefault(label, _Postings()))
+        return postings
+
+    def _index(self, key, pod):
+        self._pods[key] = pod
+        for postings in self._postings_for(pod):
+            postings.add(key)
+            self._dirty.add(postings)
+        phases = self._namespace_phases.setdefault(pod["namespace"], {})
+        phases[pod["phase"]] = phases.get(pod["phase"], 0) + 1
+        if pod["node"]:
+            self._node_pods[pod["node"]] = self._node_pods.get(pod["node"], 0) + 1
+
+    def _unindex(self, key):
+        pod = self._pods.pop(key)
+        for postings in self._postings_for(pod):
+            postings.discard(key)
+            self._dirty.add(postings)
+        phases = self._namespace_phases[pod["namespace"]]
+        phases[pod["phase"]] -= 1
+        if not phases[pod["phase"]]:
+            del phases[pod["phase"]]
+        if not phases:
+            del self._namespace_phases[pod["namespace"]]
+        if pod["node"]:
+            self._node_pods[pod["node"]] -= 1
+            if not self._node_pods[pod["node"]]:
+                del self._node_pods[pod["node"]]
+
+    def _upsert(self, pod):
+        """Index a pod, returns "added", "updated" or None when unchanged"""
+        key = pod_key(pod["namespace"], pod["name"])
+        current = self._pods.get(key)
+        if current is None:
+            self._index(key, pod)
+            return "added"
+        if pod["resource_version"] and current["resource_version"] == pod["resource_version"]:
+            return None
+        self._unindex(key)
+        self._index(key, pod)
+        return "updated"
+
+    def _flush(self):
+        for postings in self._dirty:
+            postings.flush()
+        self._dirty.clear()
+        for index in (self._by_phase, self._by_label):
+            for value in [v for v, postings in index.items() if not postings.keys]:
+                del index[value]
+
+    def sync(self, items):
+        """Reconcile the index with a full pod listing, returns change counts"""
+        # Parse and diff outside the lock so queries are only blocked for
+        # as long as it takes to apply the pods that actually changed
+        seen = set()
+        changed = []
+        for item in items:
+            pod = parse_pod(item)
+            key = pod_key(pod["namespace"], pod["name"])
+            seen.add(key)
+            current = self._pods.get(key)
+            if current is None or not pod["resource_version"] or current["resource_version"] != pod["resource_version"]:
+                changed.append(pod)
+        removed = [key for key in list(self._pods) if key not in seen]
+
+        changes = {"added": 0, "updated": 0, "removed": 0}
+        with self._lock:
+            for pod in changed:
+                change = self._upsert(pod)
+                if change:
+                    changes[change] += 1
+            for key in removed:
+                if key in self._pods:
+                    self._unindex(key)
+                    changes["removed"] += 1
+            self._flush()
+
+            if any(changes.values()):
+                self.generation += 1
+            self.last_sync = time.time()
+        return changes
+
+    # -- queries ------------------------------------------------------------
+
+    @staticmethod
+    def _page_limit(limit):
+        if limit is None:
+            return DEFAULT_PAGE_SIZE
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+        return min(limit, MAX_PAGE_SIZE)
+
+    def count(self, phase=None, labels=()):
+        """Number of pods matching all filters, without paging through them"""
+        with self._lock:
+            sets = [self._all.keys]
+            if phase is not None:
+                sets.append(self._by_phase[phase].keys if phase in self._by_phase else set())
+            for label in labels:
+                sets.append(self._by_label[label].keys if label in self._by_label else set())
+            sets.sort(key=len)
+            return len(sets[0].intersection(*sets[1:]))
+
+    def summary(self):
+        """Cluster-wide pod and node totals for the dashboard cards"""
+        with self._lock:
+            namespaces = {
+                name: {"total": sum(phases.values()), "running": phases.get("Running", 0)}
+                for name, phases in self._namespace_phases.items()
+            }
+            return {
+                "total_pods": len(self._pods),
+                "running_pods": sum(ns["running"] for ns in namespaces.values()),
+                "node_count": len(self._node_pods),
+                "namespaces": namespaces,
+            }
+
+    def query_pods(self, namespace=None, phase=None, labels=(), cursor=None, limit=None):
+        """Return one page of pods matching all filters, ordered by key.
+
+        At most MAX_SCAN_KEYS keys are examined per call (reported as
+        `scanned_keys`), so a page can hold fewer than `limit` items (even
+        none) while `next_cursor` is set; callers keep following the cursor
+        until it is None.
+        """
+        limit = self._page_limit(limit)
+        after = decode_cursor(cursor) if cursor else None
+
+        with self._lock:
+            postings = [self._all]
+            if phase is not None:
+                postings.append(self._by_phase.get(phase) or _Postings())
+            for label in labels:
+                postings.append(self._by_label.get(label) or _Postings())
+
+            # Walk the sorted order of the posting with the fewest keys inside
+            # the namespace/cursor bounds, checking membership in the others
+            ranges = []
+            for p in postings:
+                start, end = 0, len(p.order)
+                if namespace is not None:
+                    start = bisect_left(p.order, namespace + "/")
+                    # "0" is the character right after "/", closing the range
+                    end = bisect_left(p.order, namespace + "0")
+                if after is not None:
+                    start = max(start, bisect_right(p.order, after))
+                ranges.append((end - start, start, end, p))
+            ranges.sort(key=lambda r: r[0])
+            _, start, end, driver = ranges[0]
+            others = [r[3].keys for r in ranges[1:] if r[3] is not self._all]
+
+            scan_end = min(end, start + MAX_SCAN_KEYS)
+            if not others:
+                page = driver.order[start:min(end, start + limit + 1)]
+                scanned = len(page)
+                scan_end = end
+            else:
+                page = []
+                scanned = 0
+                for i in range(start, scan_end):
+                    scanned += 1
+                    key = driver.order[i]
+                    for keys in others:
+                        if key not in keys:
+                            break
+                    else:
+                        page.append(key)
+                        if len(page) > limit:
+                            break
+
+            if len(page) > limit:
+                page = page[:limit]
+                next_key = page[-1]
+            elif scan_end < end:
+                # Scan budget spent, resume after the last key looked at
+                next_key = driver.order[scan_end - 1]
+            else:
+                next_key = None
+            return {
+                "items": [self._pods[key] for key in page],
+                "next_cursor": encode_cursor(next_key) if next_key is not None else None,
+                "total_pods": len(self._pods),
+                "scanned_keys": scanned,
+                "generation": self.generation,
+            }
+
+    def query_namespaces(self, phase=None, cursor=None, limit=None):
+        """Return one page of per-namespace pod counts, ordered by name"""
+        limit = self._page_limit(limit)
+        after = decode_cursor(cursor) if cursor else None
+
+        with self._lock:
+            names = sorted(self._namespace_phases)
+            if after is not None:
+                names = names[bisect_right(names, after):]
+
+            page = []
+            for name in names:
+                phases = self._namespace_phases[name]
+                if phase is not None and phase not in phases:
+                    continue
+                page.append({
+                    "namespace": name,
+                    "total": sum(phases.values()),
+                    "running": phases.get("Running", 0),
+                    "phases": dict(phases),
+                })
+                if len(page) > limit:
+                    break
+
+            has_more = len(page) > limit
+            page = page[:limit]
+            return {
+                "items": page,
+                "next_cursor": encode_cursor(page[-1]["namespace"]) if has_more else None,
+                "total_namespaces": len(self._namespace_phases),
+                "generation": self.generation,
+            }
@@ -0,0 +1,157 @@
+"""Synthetic uptime prober for the portfolio and status API endpoints.
+
+Every target is probed concurrently on a fixed schedule and the outcome is
+kept in a bounded in-memory store, which is where the uptime and latency
+figures on the dashboards come from.
+"""
+import asyncio
+import threading
+import time
+from bisect import bisect_left
+from collections import deque
+from datetime import datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# /api/status renders by reading /api/uptime back from the status API, so
+# probing it would fold that cross-service hop into the figure; the JSON
+# /api/api-status route is self-contained
+DEFAULT_TARGETS = [
+    "https://prash.shop/",
+    "https://prash.shop/api/health",
+    "https://prash.shop/api/api-status",
+]
+
+# Upper bounds of the latency histogram buckets in milliseconds
+LATENCY_BUCKETS_MS = (10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, -(-len(sorted_values) * pct // 100))
+    return sorted_values[rank - 1]
+
+
+class ProbeStore:
+    """Bounded per-target history of probe results.
+
+    Every figure in `summary()`, the histogram included, is computed from
+    the same retained window of at most `max_samples` probes.
+    """
+
+    def __init__(self, max_samples=1440):
+        self.max_samples = max_samples
+        self._lock = threading.Lock()
+        self._samples = {}
+        self._last = {}
+
+    def record(self, target, ok, latency_ms, status_code=None, error=None):
+        now = time.time()
+        with self._lock:
+            samples = self._samples.get(target)
+            if samples is None:
+                samples = self._samples[target] = deque(maxlen=self.max_samples)
+            samples.append((now, ok, latency_ms))
+
+            self._last[target] = {
+                "status_code": status_code,
+                "error": error,
+                "timestamp": now,
+            }
+
+    def summary(self, target=None):
+        """Uptime and latency percentiles over the retained window"""
+        with self._lock:
+            targets = [target] if target is not None else list(self._samples)
+            result = {}
+            for name in targets:
+                samples = list(self._samples.get(name, ()))
+                if not samples:
+                    continue
+                latencies = sorted(latency for _, ok, latency in samples if ok)
+                up = sum(1 for _, ok, _ in samples if ok)
+                last = self._last[name]
+
+                histogram = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+                for latency in latencies:
+                    histogram[bisect_left(LATENCY_BUCKETS_MS, latency)] += 1
+
+                result[name] = {
+                    "samples": len(samples),
+                    "window_seconds": round(samples[-1][0] - samples[0][0]),
+                    "uptime_percent": round(100.0 * up / len(samples), 2),
+                    "p50_ms": percentile(latencies, 50),
+                    "p99_ms": percentile(latencies, 99),
+                    "histogram_ms": {
+                        **{f"le_{bound}": histogram[i] for i, bound in enumerate(LATENCY_BUCKETS_MS)},
+                        "gt_5000": histogram[-1],
+                    },
+                    "last_status": last["status_code"],
+                    "last_error": last["error"],
+                    "last_probe": datetime.utcfromtimestamp(last["timestamp"]).isoformat() + "Z",
+                }
+            return result
+
+
+class UptimeProber:
+    """Probe a set of URLs concurrently with asyncio on a fixed interval.
+
+    Each target gets its own pooled `requests.Session`, so repeated probes
+    reuse the TCP/TLS connection, and the blocking calls run on the default
+    executor so all targets are in flight at once.
+    """
+
+    def __init__(self, targets=None, interval=30, timeout=5, store=None):
+        self.targets = list(targets or DEFAULT_TARGETS)
+        self.interval = interval
+        self.timeout = timeout
+        self.store = store or ProbeStore()
+        self._sessions = {}
+
+    def _session(self, target):
+        session = self._sessions.get(target)
+        if session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=1)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            session.headers["User-Agent"] = "status-api-uptime-prober"
+            self._sessions[target] = session
+        return session
+
+    def _probe_blocking(self, target):
+        session = self._session(target)
+        start = time.perf_counter()
+        try:
+            response = session.get(target, timeout=self.timeout)
+            latency_ms = round((time.perf_counter() - start) * 1000, 1)
+            ok = response.status_code < 400
+            self.store.record(target, ok, latency_ms, status_code=response.status_code,
+                              error=None if ok else f"HTTP {response.status_code}")
+        except Exception as e:
+            latency_ms = round((time.perf_counter() - start) * 1000, 1)
+            self.store.record(target, False, latency_ms, error=str(e))
+
+    async def probe_once(self):
+        """Probe every target concurrently and wait for all of them"""
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(
+            loop.run_in_executor(None, self._probe_blocking, target)
+            for target in self.targets
+        ))
+
+    async def run(self):
+        while True:
+            started = time.monotonic()
+            await self.probe_once()
+            await asyncio.sleep(max(0, self.interval - (time.monotonic() - started)))
+
+    def start(self):
+        """Run the probe loop on its own event loop in a daemon thread"""
+        thread = threading.Thread(target=asyncio.run, args=(self.run(),),
+                                  name="uptime-prober", daemon=True)
+        thread.start()
+        return thread
@@ -0,0 +1,168 @@
+"""Adaptive collection scheduler for the status API metric sources.
+
+Each source is polled on an interval derived from how many people are
+currently looking at the dashboards, how slow the source has been and how
+often it fails, so cluster API load follows actual use instead of a fixed
+timer.
+"""
+import threading
+import time
+
+# A source should spend at most 1/LATENCY_DUTY_FACTOR of its time collecting
+LATENCY_DUTY_FACTOR = 20
+# Weight of the newest observation in the latency and error rate averages
+EWMA_ALPHA = 0.3
+
+
+class SourceSchedule:
+    """Polling state and the last interval decision for one source"""
+
+    def __init__(self, name, collect, active_interval, idle_interval, max_interval):
+        self.name = name
+        self.collect = collect
+        self.active_interval = active_interval
+        self.idle_interval = idle_interval
+        self.max_interval = max_interval
+        self.latency_ewma = None
+        self.error_rate = 0.0
+        self.consecutive_failures = 0
+        self.last_run = None
+        self.next_run = 0.0
+        self.interval = active_interval
+        self.reason = "startup"
+        self.last_error = None
+
+
+class AdaptiveScheduler:
+    """Runs registered sources when due and re-plans them after every run.
+
+    Dashboards call `note_demand()` per request. While anyone has been seen
+    within `demand_window` seconds sources poll at their active interval,
+    otherwise they idle down. Slow sources are held to a latency-based floor
+    and failing ones back off exponentially up to their max interval.
+    """
+
+    def __init__(self, demand_window=120, on_result=None, clock=time.monotonic):
+        self.demand_window = demand_window
+        self.on_result = on_result
+        self.clock = clock
+        self.sources = {}
+        self._viewers = {}
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+
+    def add_source(self, name, collect, active_interval, idle_interval=300, max_interval=600):
+        self.sources[name] = SourceSchedule(name, collect, active_interval, idle_interval, max_interval)
+
+    # -- demand -------------------------------------------------------------
+
+    def note_demand(self, viewer):
+        """Record a dashboard/API hit, pulling idle sources forward if needed"""
+        now = self.clock()
+        with self._lock:
+            was_idle = not self._active_viewers(now)
+            self._viewers[viewer] = now
+            if not was_idle:
+                return
+            # Re-plan so the reported decision matches the pace now in effect
+            for source in self.sources.values():
+                if source.last_run is not None:
+                    source.interval, source.reason = self._plan(source, now)
+                    source.next_run = min(source.next_run, source.last_run + source.interval)
+        self._wake.set()
+
+    def _active_viewers(self, now):
+        cutoff = now - self.demand_window
+        for viewer in [v for v, seen in self._viewers.items() if seen < cutoff]:
+            del self._viewers[viewer]
+        return len(self._viewers)
+
+    def viewers(self):
+        with self._lock:
+            return self._active_viewers(self.clock())
+
+    # -- planning -----------------------------------------------------------
+
+    def _plan(self, source, now):
+        viewers = self._active_viewers(now)
+        if viewers:
+            interval, reason = source.active_interval, f"{viewers} active viewer(s)"
+        else:
+            interval, reason = source.idle_interval, "idle, no viewers"
+
+        if source.latency_ewma is not None and source.latency_ewma * LATENCY_DUTY_FACTOR > interval:
+            interval, reason = source.latency_ewma * LATENCY_DUTY_FACTOR, "slow source"
+
+        interval *= 1 + source.error_rate
+        if source.consecutive_failures:
+            backoff = source.active_interval * 2 ** source.consecutive_failures
+            if backoff > interval:
+                interval = backoff
+                reason = f"backoff after {source.consecutive_failures} failure(s)"
+
+        return min(interval, source.max_interval), reason
+
+    def run_source(self, source):
+        start = self.clock()
+        error = None
+        try:
+            source.collect()
+        except Exception as e:
+            error = str(e)
+        now = self.clock()
+        latency = now - start
+
+        with self._lock:
+            source.latency_ewma = latency if source.latency_ewma is None else \
+                EWMA_ALPHA * latency + (1 - EWMA_ALPHA) * source.latency_ewma
+            source.error_rate = EWMA_ALPHA * (error is not None) + (1 - EWMA_ALPHA) * source.error_rate
+            source.consecutive_failures = source.consecutive_failures + 1 if error else 0
+            source.last_error = error
+            source.last_run = now
+            source.interval, source.reason = self._plan(source, now)
+            source.next_run = now + source.interval
+
+        if self.on_result is not None:
+            self.on_result(source.name, error is None, error)
+
+    def run_due(self):
+        """Run every source that is due, returns the names that ran"""
+        now = self.clock()
+        due = [s for s in self.sources.values() if s.next_run <= now]
+        for source in due:
+            self.run_source(source)
+        return [source.name for source in due]
+
+    def run(self):
+        while True:
+            self.run_due()
+            with self._lock:
+                next_run = min((s.next_run for s in self.sources.values()), default=self.clock() + 60)
+            self._wake.wait(max(0, next_run - self.clock()))
+            self._wake.clear()
+
+    def start(self):
+        thread = threading.Thread(target=self.run, name="collection-scheduler", daemon=True)
+        thread.start()
+        return thread
+
+    def decisions(self):
+        """Current interval per source and why, for /api/status"""
+        now = self.clock()
+        with self._lock:
+            return {
+                "active_viewers": self._active_viewers(now),
+                "demand_window_seconds": self.demand_window,
+                "sources": {
+                    source.name: {
+                        "interval_seconds": round(source.interval, 1),
+                        "reason": source.reason,
+                        "next_run_in_seconds": round(max(0, source.next_run - now), 1),
+                        "latency_ms": None if source.latency_ewma is None else round(source.latency_ewma * 1000, 1),
+                        "error_rate": round(source.error_rate, 3),
+                        "consecutive_failures": source.consecutive_failures,
+                        "last_error": source.last_error,
+                    }
+                    for source in self.sources.values()
+                },
+            }
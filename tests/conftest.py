@@ -0,0 +1,38 @@
+import os
+import sys
+import pytest
+from bs4 import BeautifulSoup
+
+ROOT = os.path.join(os.path.dirname(__file__), '..')
+
+# build.py lives at the repo root and the status API is a standalone service
+# directory, neither is an installed package
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.join(ROOT, 'services', 'status-api'))
+
+from build import PAGES, AssetBuilder
+
+@pytest.fixture(scope='session')
+def documents():
+    """Every served page, read and parsed once for the whole session"""
+    parsed = {}
+    for page in PAGES:
+        with open(os.path.join(ROOT, page), 'r') as f:
+            source = f.read()
+        parsed[page] = {"source": source, "soup": BeautifulSoup(source, 'html.parser')}
+    return parsed
+
+@pytest.fixture(scope='session')
+def built_site(tmp_path_factory):
+    """The pages built once into a temporary dist/, with the build report"""
+    out = tmp_path_factory.mktemp('dist')
+    report = AssetBuilder(ROOT, str(out)).build()
+    return out, report
+
+@pytest.fixture(scope='session')
+def index_source(documents):
+    return documents['index.html']["source"]
+
+@pytest.fixture(scope='session')
+def index_soup(documents):
+    return documents['index.html']["soup"]
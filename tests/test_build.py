@@ -0,0 +1,51 @@
+import os
+import re
+import pytest
+from bs4 import BeautifulSoup
+import build
+
+def test_minify_css_keeps_strings():
+    """Test CSS minification leaves string contents alone"""
+    css = """
+        /* theme */
+        body { font-family: 'Segoe UI',  Tahoma; }
+        a::after { content: "a  /* b */  c"; }
+    """
+    assert build.minify_css(css) == "body{font-family:'Segoe UI',Tahoma}a::after{content:\"a  /* b */  c\"}"
+
+def test_minify_html_preserves_pre():
+    """Test whitespace collapses everywhere except raw blocks"""
+    html = "<p>\n  hello   world <!-- note -->\n</p><pre>  keep\n  me</pre>"
+    assert build.minify_html(html) == "<p> hello world </p><pre>  keep\n  me</pre>\n"
+
+def test_build_output(built_site):
+    """Test the built pages are smaller, fingerprinted and precompressed"""
+    out, report = built_site
+    files = os.listdir(out)
+
+    for stats in report:
+        assert stats["after"] < stats["before"]
+        assert f"{stats['page']}.gz" in files
+
+    with open(out / 'index.html') as f:
+        soup = BeautifulSoup(f.read(), 'html.parser')
+    assert soup.find('title') is not None
+    assert soup.find('body') is not None
+
+    for img in soup.find_all('img'):
+        assert img['src'] in files, f"{img['src']} missing from build output"
+        assert re.search(r'\.[0-9a-f]{10}\.', img['src']), f"{img['src']} is not fingerprinted"
+
+    if build.Image is not None:
+        for source in soup.select('picture source'):
+            for candidate in source['srcset'].split(', '):
+                assert candidate.split()[0] in files
+
+def test_build_refuses_to_overwrite_sources(tmp_path):
+    """Test the output directory can't be the source tree or a parent of it"""
+    src = tmp_path / 'site'
+    src.mkdir()
+    for out in (src, tmp_path, src / '..'):
+        with pytest.raises(ValueError):
+            build.AssetBuilder(str(src), str(out))
+    assert src.is_dir()
@@ -0,0 +1,131 @@
+"""Page weight budgets for the built site.
+
+Byte figures cover only what nginx serves from the build output. Remote
+resources (CDN scripts, Google Fonts, Vercel analytics) aren't measured in
+bytes, so they get their own budget as a request count instead.
+"""
+import os
+import re
+import pytest
+from bs4 import BeautifulSoup
+import build
+
+# Per-page budgets in bytes/counts for the built site, sized a little above
+# the current build so regressions fail CI. Tighten them as the pages get
+# lighter.
+BUDGETS = {
+    'index.html': {
+        "total_bytes": 24_000,
+        "image_bytes": 12_000,
+        "blocking_scripts": 0,
+        "blocking_stylesheets": 0,
+        "largest_asset_bytes": 12_000,
+        # Google Fonts CSS and Vercel analytics
+        "third_party_requests": 2,
+    },
+    'resume.html': {
+        "total_bytes": 6_000,
+        "image_bytes": 0,
+        "blocking_scripts": 2,
+        "blocking_stylesheets": 0,
+        "largest_asset_bytes": 6_000,
+        # Google Fonts CSS plus html2canvas and jsPDF from cdnjs, about
+        # 550 KB of uncompressed script that the byte figures don't include
+        "third_party_requests": 3,
+    },
+}
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.webp', '.avif', '.svg', '.ico')
+CSS_URL = re.compile(r'url\(\s*[\'"]?([^\'")]+)[\'"]?\s*\)')
+CSS_IMPORT = re.compile(r'@import\s')
+
+# Without Pillow the build only fingerprints images, which the budgets don't cover
+requires_pillow = pytest.mark.skipif(build.Image is None, reason="Pillow is needed to build responsive images")
+
+def third_party_requests(soup):
+    """Remote scripts and stylesheets the page fetches with scripting on"""
+    refs = [script.get('src') for script in soup.find_all('script', src=True)]
+    refs += [link.get('href') for link in soup.find_all('link')
+             if set(link.get('rel') or []) & {'stylesheet', 'preload'} and link.find_parent('noscript') is None]
+    return sorted({ref for ref in refs if ref and not build.is_local(ref)})
+
+def local_assets(soup):
+    """Local files the page pulls in, from markup and inline CSS.
+
+    A <picture> counts once, as the first candidate of its first <source>
+    (the smallest variant in the preferred format); its <img> fallback and
+    the other variants are alternatives rather than extra downloads.
+    """
+    refs = []
+    for picture in soup.find_all('picture'):
+        source = picture.find('source')
+        if source is not None and source.get('srcset'):
+            refs.append(source['srcset'].split(',')[0].split()[0])
+    refs += [img.get('src') for img in soup.find_all('img') if img.find_parent('picture') is None]
+    refs += [script.get('src') for script in soup.find_all('script')]
+    refs += [link.get('href') for link in soup.find_all('link')
+             if set(link.get('rel') or []) & {'stylesheet', 'icon', 'preload'}]
+
+    css = ' '.join(style.get_text() for style in soup.find_all('style'))
+    css += ' '.join(tag['style'] for tag in soup.find_all(style=True))
+    refs += CSS_URL.findall(css)
+
+    return sorted({ref.split('?')[0].lstrip('/') for ref in refs if ref and build.is_local(ref)})
+
+def transfer_size(out, name):
+    """Bytes on the wire: the .gz sibling when nginx has one to serve"""
+    path = os.path.join(out, name)
+    assert os.path.exists(path), f"build references missing asset {name}"
+    if os.path.exists(path + '.gz'):
+        path += '.gz'
+    return os.path.getsize(path)
+
+def measure(out, page):
+    with open(os.path.join(out, page)) as f:
+        soup = BeautifulSoup(f.read(), 'html.parser')
+
+    sizes = {page: transfer_size(out, page)}
+    for asset in local_assets(soup):
+        sizes[asset] = transfer_size(out, asset)
+
+    head = soup.find('head') or soup
+    blocking_scripts = [
+        s for s in head.find_all('script', src=True)
+        if not s.has_attr('async') and not s.has_attr('defer') and s.get('type') != 'module'
+    ]
+    # <noscript> fallbacks only apply with scripting off, and media="print"
+    # stylesheets don't block rendering
+    blocking_stylesheets = [
+        l for l in head.find_all('link', rel='stylesheet')
+        if l.get('media', 'all') in ('all', 'screen') and l.find_parent('noscript') is None
+    ] + CSS_IMPORT.findall(' '.join(s.get_text() for s in head.find_all('style')))
+
+    return {
+        "total_bytes": sum(sizes.values()),
+        "image_bytes": sum(size for name, size in sizes.items() if name.lower().endswith(IMAGE_EXTENSIONS)),
+        "blocking_scripts": len(blocking_scripts),
+        "blocking_stylesheets": len(blocking_stylesheets),
+        "largest_asset_bytes": max(sizes.values()),
+        "largest_asset": max(sizes, key=sizes.get),
+        "third_party_requests": len(third_party_requests(soup)),
+    }
+
+@pytest.fixture(scope='session')
+def measurements(built_site):
+    out, _ = built_site
+    return {page: measure(out, page) for page in build.PAGES}
+
+def test_every_page_has_a_budget():
+    """Test new pages can't ship without a budget"""
+    assert set(build.PAGES) == set(BUDGETS)
+
+@requires_pillow
+@pytest.mark.parametrize('page', build.PAGES)
+@pytest.mark.parametrize('metric', list(BUDGETS['index.html']))
+def test_page_within_budget(measurements, page, metric):
+    """Test page weight, image bytes, blocking resources, largest asset and third-party requests"""
+    measured = measurements[page]
+    budget = BUDGETS[page][metric]
+
+    detail = f" ({measured['largest_asset']})" if metric == "largest_asset_bytes" else ""
+    assert measured[metric] <= budget, f"{page} {metric} is {measured[metric]}{detail}, budget {budget}"
@@ -0,0 +1,157 @@
+import time
+import pytest
+from pod_index import MAX_SCAN_KEYS, PodIndex, parse_label_selector
+
+def make_pod(namespace, name, phase='Running', labels=None, version='1'):
+    return {
+        "metadata": {
+            "name": name,
+            "namespace": namespace,
+            "labels": labels or {},
+            "resourceVersion": version
+        },
+        "spec": {"nodeName": "node-1"},
+        "status": {
+            "phase": phase,
+            "containerStatuses": [{"ready": phase == 'Running', "restartCount": 0}]
+        }
+    }
+
+@pytest.fixture
+def index():
+    pods = PodIndex()
+    pods.sync([
+        make_pod('default', 'portfolio-a', labels={'app': 'portfolio'}),
+        make_pod('default', 'portfolio-b', labels={'app': 'portfolio'}),
+        make_pod('default', 'status-api', labels={'app': 'status-api'}),
+        make_pod('monitoring', 'prometheus', labels={'app': 'prometheus'}),
+        make_pod('monitoring', 'migrate', phase='Failed'),
+    ])
+    return pods
+
+def test_filters(index):
+    """Test namespace, phase and label filters combine"""
+    names = lambda page: [p["name"] for p in page["items"]]
+
+    assert names(index.query_pods(namespace='default')) == ['portfolio-a', 'portfolio-b', 'status-api']
+    assert names(index.query_pods(phase='Failed')) == ['migrate']
+    assert names(index.query_pods(labels=[('app', 'portfolio')])) == ['portfolio-a', 'portfolio-b']
+    assert names(index.query_pods(namespace='monitoring', labels=[('app', 'portfolio')])) == []
+
+def test_summary_and_count(index):
+    """Test dashboard totals come straight from the index"""
+    summary = index.summary()
+    assert summary["total_pods"] == 5
+    assert summary["running_pods"] == 4
+    assert summary["node_count"] == 1
+    assert summary["namespaces"]["monitoring"] == {"total": 2, "running": 1}
+
+    assert index.count(phase='Running', labels=[('app', 'portfolio')]) == 2
+    assert index.count(phase='Pending') == 0
+
+    index.sync([])
+    assert index.summary() == {"total_pods": 0, "running_pods": 0, "node_count": 0, "namespaces": {}}
+
+def test_cursor_pagination(index):
+    """Test cursors walk every pod exactly once"""
+    seen = []
+    cursor = None
+    while True:
+        page = index.query_pods(cursor=cursor, limit=2)
+        seen.extend(p["name"] for p in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert len(seen) == 5
+    assert len(set(seen)) == 5
+
+    with pytest.raises(ValueError):
+        index.query_pods(cursor='!!not-a-cursor!!')
+
+def test_incremental_sync(index):
+    """Test sync only reports pods that actually changed"""
+    changes = index.sync([
+        make_pod('default', 'portfolio-a', labels={'app': 'portfolio'}),
+        make_pod('default', 'portfolio-b', phase='Pending', labels={'app': 'portfolio'}, version='2'),
+        make_pod('default', 'status-api', labels={'app': 'status-api'}),
+        make_pod('monitoring', 'prometheus', labels={'app': 'prometheus'}),
+        make_pod('redis', 'redis-0', labels={'app': 'redis'}),
+    ])
+
+    assert changes == {"added": 1, "updated": 1, "removed": 1}
+    assert [p["name"] for p in index.query_pods(phase='Pending')["items"]] == ['portfolio-b']
+    assert index.query_pods(phase='Failed')["items"] == []
+
+    namespaces = {ns["namespace"]: ns for ns in index.query_namespaces()["items"]}
+    assert namespaces['default'] == {"namespace": 'default', "total": 3, "running": 2, "phases": {'Running': 2, 'Pending': 1}}
+    assert 'redis' in namespaces
+
+    index.sync([])
+    assert index.query_namespaces()["items"] == []
+    assert 'redis' not in [ns["namespace"] for ns in index.query_namespaces()["items"]]
+
+def test_label_selector():
+    """Test label selector parsing"""
+    assert parse_label_selector(['app=portfolio,tier=web']) == [('app', 'portfolio'), ('tier', 'web')]
+    assert parse_label_selector(['app==portfolio']) == [('app', 'portfolio')]
+    for selector in ['app', 'app!=x', '!app', 'tier in (web,db)', 'tier notin (web)', 'app=in(x)']:
+        with pytest.raises(ValueError):
+            parse_label_selector([selector])
+
+def test_large_cluster_query_speed():
+    """Test drill-down queries stay under a millisecond on a large cluster"""
+    pods = PodIndex()
+    pods.sync([
+        make_pod(f'ns-{i % 200}', f'pod-{i}', phase='Running' if i % 10 else 'Pending', labels={'app': f'app-{i % 50}', 'tier': 'web' if i % 2 else 'db'})
+        for i in range(30000)
+    ])
+
+    queries = [
+        {},
+        {"namespace": 'ns-7'},
+        {"phase": 'Pending'},
+        {"labels": [('app', 'app-3')]},
+        {"namespace": 'ns-42', "phase": 'Running', "labels": [('app', 'app-42')]},
+        # Worst case: two large labels that never overlap, the scan budget
+        # returns an empty page with a cursor instead of walking 15k keys
+        {"labels": [('tier', 'web'), ('tier', 'db')]},
+    ]
+    for query in queries:
+        # The scan bound is what keeps the time down, so check it exactly
+        assert pods.query_pods(**query)["scanned_keys"] <= MAX_SCAN_KEYS, query
+
+        timings = []
+        for _ in range(20):
+            start = time.perf_counter()
+            pods.query_pods(**query)
+            timings.append(time.perf_counter() - start)
+        # Median of the runs so one scheduler hiccup doesn't fail the test,
+        # judged per query rather than averaged with the cheap ones
+        elapsed = sorted(timings)[len(timings) // 2]
+        assert elapsed < 0.001, f"{query} took {elapsed * 1000:.3f}ms"
+
+def test_scan_budget_keeps_cursor_complete():
+    """Test partial pages from the scan budget still reach every match"""
+    pods = PodIndex()
+    pods.sync([
+        make_pod('default', f'pod-{i:05d}', labels={
+            'tier': 'web' if i % 2 else 'db',
+            'group': 'a' if i % 2 or i % 997 == 0 else 'b'
+        })
+        for i in range(20000)
+    ])
+
+    seen = []
+    cursor = None
+    pages = 0
+    while True:
+        page = pods.query_pods(labels=[('tier', 'db'), ('group', 'a')], cursor=cursor, limit=100)
+        pages += 1
+        seen.extend(p["name"] for p in page["items"])
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert seen == [f'pod-{i:05d}' for i in range(0, 20000, 2) if i % 997 == 0]
+    assert pages > 1, "expected the scan budget to split the walk"
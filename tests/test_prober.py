@@ -0,0 +1,92 @@
+import asyncio
+import socket
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from prober import ProbeStore, UptimeProber, percentile
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    connections = set()
+
+    def do_GET(self):
+        StandInHandler.connections.add(self.client_address)
+        body = b'ok'
+        self.send_response(500 if self.path == '/broken' else 200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def stand_in():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StandInHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    StandInHandler.connections.clear()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+def unused_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+def test_probes_record_uptime_and_latency(stand_in):
+    """Test healthy, failing and unreachable targets against local servers"""
+    down = f"http://127.0.0.1:{unused_port()}/"
+    prober = UptimeProber([f"{stand_in}/", f"{stand_in}/broken", down], timeout=1)
+
+    for _ in range(3):
+        asyncio.run(prober.probe_once())
+    summary = prober.store.summary()
+
+    healthy = summary[f"{stand_in}/"]
+    assert healthy["samples"] == 3
+    assert healthy["uptime_percent"] == 100.0
+    assert healthy["p50_ms"] is not None and healthy["p99_ms"] >= healthy["p50_ms"]
+    assert sum(healthy["histogram_ms"].values()) == 3
+
+    assert summary[f"{stand_in}/broken"]["uptime_percent"] == 0.0
+    assert summary[f"{stand_in}/broken"]["last_error"] == "HTTP 500"
+    assert summary[down]["uptime_percent"] == 0.0
+    assert summary[down]["last_status"] is None
+
+def test_connections_are_pooled(stand_in):
+    """Test repeated probes reuse one keep-alive connection per target"""
+    prober = UptimeProber([f"{stand_in}/"], timeout=1)
+    for _ in range(5):
+        asyncio.run(prober.probe_once())
+
+    assert len(StandInHandler.connections) == 1
+
+def test_store_is_bounded():
+    """Test the store only keeps the newest samples"""
+    store = ProbeStore(max_samples=10)
+    for i in range(100):
+        store.record('target', i % 4 != 0, float(i))
+
+    summary = store.summary()['target']
+    assert summary["samples"] == 10
+    assert summary["uptime_percent"] == 80.0
+
+def test_percentile():
+    """Test nearest-rank percentiles"""
+    values = list(range(1, 101))
+    assert percentile(values, 50) == 50
+    assert percentile(values, 99) == 99
+    assert percentile([], 50) is None
+
+def test_histogram_matches_window():
+    """Test the histogram covers the same samples as the percentiles"""
+    store = ProbeStore(max_samples=10)
+    for i in range(75):
+        store.record('target', True, 20.0 if i < 70 else 400.0)
+
+    summary = store.summary()['target']
+    assert sum(summary["histogram_ms"].values()) == summary["samples"] == 10
+    assert summary["histogram_ms"]["le_25"] == 5
+    assert summary["histogram_ms"]["le_500"] == 5
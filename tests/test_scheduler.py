@@ -0,0 +1,102 @@
+import pytest
+from scheduler import AdaptiveScheduler, LATENCY_DUTY_FACTOR
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+def make_scheduler(clock, collect=lambda: None, results=None):
+    scheduler = AdaptiveScheduler(demand_window=120, clock=clock,
+                                  on_result=lambda *r: results.append(r) if results is not None else None)
+    scheduler.add_source('kubectl', collect, 30, idle_interval=300, max_interval=600)
+    return scheduler
+
+def test_idles_down_without_viewers(clock):
+    """Test sources poll slowly while nobody is watching"""
+    scheduler = make_scheduler(clock)
+
+    assert scheduler.run_due() == ['kubectl']
+    source = scheduler.sources['kubectl']
+    assert source.interval == 300
+    assert source.reason == "idle, no viewers"
+
+def test_demand_pulls_collection_forward(clock):
+    """Test a new viewer brings an idle source forward to its active pace"""
+    scheduler = make_scheduler(clock)
+    scheduler.run_due()
+
+    clock.now += 10
+    scheduler.note_demand('10.0.0.1')
+    source = scheduler.sources['kubectl']
+    assert source.next_run == pytest.approx(1030.0)
+
+    decision = scheduler.decisions()
+    assert decision["active_viewers"] == 1
+    assert decision["sources"]["kubectl"]["interval_seconds"] == 30
+    assert decision["sources"]["kubectl"]["reason"] == "1 active viewer(s)"
+
+    clock.now += 20
+    assert scheduler.run_due() == ['kubectl']
+    assert source.interval == 30
+    assert source.reason == "1 active viewer(s)"
+
+    clock.now += 200
+    assert scheduler.viewers() == 0
+
+def test_backs_off_exponentially_on_failures(clock):
+    """Test consecutive failures double the interval up to the cap"""
+    def fail():
+        raise RuntimeError("kubectl failed")
+
+    results = []
+    scheduler = make_scheduler(clock, fail, results)
+    source = scheduler.sources['kubectl']
+
+    intervals = []
+    for _ in range(6):
+        clock.now = source.next_run
+        scheduler.note_demand('viewer')
+        scheduler.run_due()
+        intervals.append(source.interval)
+
+    assert intervals[:4] == [60, 120, 240, 480]
+    assert intervals[-1] == 600
+    assert source.reason.startswith("backoff")
+    assert results[-1] == ('kubectl', False, "kubectl failed")
+
+    source.collect = lambda: None
+    clock.now = source.next_run
+    scheduler.note_demand('viewer')
+    scheduler.run_due()
+    assert source.consecutive_failures == 0
+    assert 30 < source.interval < 60
+
+def test_slow_sources_are_floored(clock):
+    """Test a slow source isn't polled more often than its latency allows"""
+    def slow():
+        clock.now += 3
+
+    scheduler = make_scheduler(clock, slow)
+    scheduler.note_demand('viewer')
+    scheduler.run_due()
+
+    source = scheduler.sources['kubectl']
+    assert source.interval == 3 * LATENCY_DUTY_FACTOR
+    assert source.reason == "slow source"
+
+def test_decisions_are_exposed_in_api_status():
+    """Test /api/status reports the scheduler decisions"""
+    import app as status_api
+
+    response = status_api.app.test_client().get('/api/status')
+    schedule = response.json["collection_schedule"]
+
+    assert schedule["active_viewers"] >= 1
+    assert set(schedule["sources"]) == {'kubectl', 'prometheus'}
@@ -0,0 +1,51 @@
+import time
+import pytest
+import app as status_api
+
+@pytest.fixture
+def client():
+    status_api.pod_index.last_sync = None
+    status_api.source_status.clear()
+    return status_api.app.test_client()
+
+def test_liveness_is_preencoded(client, caplog):
+    """Test /health answers with the static body and skips request logging"""
+    with caplog.at_level('INFO'):
+        response = client.get('/health')
+
+    assert response.status_code == 200
+    assert response.data == status_api.LIVENESS_BODY
+    assert not [r for r in caplog.records if r.name == status_api.logger.name]
+
+def test_readiness_requires_fresh_snapshot(client):
+    """Test /ready only passes once the collector has fresh data"""
+    response = client.get('/ready')
+    assert response.status_code == 503
+    assert response.json["snapshot"]["fresh"] is False
+
+    status_api.pod_index.sync([])
+    status_api.record_source('kubectl', True)
+    response = client.get('/ready')
+    assert response.status_code == 200
+    assert response.json["sources"]["kubectl"]["reachable"] is True
+
+    status_api.pod_index.last_sync = time.time() - 10 * status_api.POD_INDEX_REFRESH_SECONDS
+    assert client.get('/ready').status_code == 503
+
+def test_dashboard_reads_pod_index(client, monkeypatch):
+    """Test the dashboards show pod index totals once it has synced"""
+    assert client.get('/api/status').json["data_source"] == "static"
+
+    status_api.pod_index.sync([
+        {"metadata": {"name": "portfolio-a", "namespace": "default", "labels": {"app": "portfolio"}},
+         "spec": {"nodeName": "node-1"}, "status": {"phase": "Running"}},
+    ])
+    status_api.record_source('kubectl', True)
+    response = client.get('/api/status')
+    assert response.json["data_source"] == "live"
+    assert response.json["services"]["portfolio_app"]["pods"] == 1
+
+    # A backing-off source doesn't slow the page down to its retry interval
+    kubectl = status_api.collection_scheduler.sources['kubectl']
+    monkeypatch.setattr(kubectl, 'interval', 600)
+    assert f'Auto-refresh: {kubectl.active_interval}s'.encode() in client.get('/status').data